@@ -3,13 +3,20 @@ Black-Scholes Option Pricing Application
 A Streamlit app for option pricing with live market data.
 """
 
+import joblib
 import streamlit as st
 import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from streamlit_autorefresh import st_autorefresh
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from bs_model import BlackScholesModel
+import bs_model_numba as bs_numba
 
 # ------------------------------------------------------------------ #
 #  Page config                                                         #
@@ -39,41 +46,425 @@ COLOURS = {
     'breakeven':  '#7B1FA2',
 }
 
+# ------------------------------------------------------------------ #
+#  Compiled kernels — JIT / cache load once per server process        #
+# ------------------------------------------------------------------ #
+
+@st.cache_resource
+def warm_up_kernels() -> None:
+    bs_numba.warm_up()
+
+
+warm_up_kernels()
+
 # ------------------------------------------------------------------ #
 #  Cached data fetchers                                                #
 # ------------------------------------------------------------------ #
+# Each fetcher builds its own yf.Ticker: construction does no I/O, and a
+# shared instance would memoise data past these TTLs and be used from
+# several session threads at once.
+
+# ---- Disk layer: survives restarts and rate-limit backoff ---------- #
+
+_disk = joblib.Memory(Path(__file__).parent / '.cache', verbose=0)
+
+HISTORY_DISK_TTL = 4 * 3600   # daily bars
+CHAIN_DISK_TTL   = 2 * 60     # intraday quotes — IV here feeds the headline price
+DISK_MAX_AGE     = timedelta(days=1)
+
+
+class _EmptyPayload(Exception):
+    """yfinance returned nothing (it signals rate limits / network errors this way)."""
+
+
+@_disk.cache
+def _history_payload(ticker: str, period: str):
+    history = yf.Ticker(ticker).history(period=period)
+    if history.empty:
+        # Raising keeps the failure out of the disk cache
+        raise _EmptyPayload(history)
+    return time.time(), history
+
+
+@_disk.cache
+def _chain_payload(ticker: str, expiry: str):
+    chain = yf.Ticker(ticker).option_chain(expiry)
+    if chain.calls.empty and chain.puts.empty:
+        raise _EmptyPayload((chain.calls, chain.puts))
+    return time.time(), (chain.calls, chain.puts)
+
+
+def _disk_cached(func, ttl: float, *args):
+    """
+    Serve func's (fetched_at, payload) entry from disk, refetching once older
+    than ttl s. Empty fetches are never persisted; if a refetch comes back
+    empty, the stale entry is served instead.
+    """
+    try:
+        fetched_at, payload = func(*args)
+    except _EmptyPayload as empty:
+        return empty.args[0]
+    if time.time() - fetched_at > ttl:
+        try:
+            (fetched_at, payload), _ = func.call(*args)   # overwrites the entry
+        except _EmptyPayload:
+            pass
+    return payload
+
+
+@st.cache_resource(ttl=3600)
+def prune_disk_cache() -> None:
+    """Drop entries not read for a day — past expiries, abandoned tickers."""
+    _disk.reduce_size(age_limit=DISK_MAX_AGE)
+
 
 @st.cache_data(ttl=60)
 def fetch_price_history(ticker: str, period: str = '3mo') -> pd.DataFrame:
-    return yf.Ticker(ticker).history(period=period)
+    return _disk_cached(_history_payload, HISTORY_DISK_TTL, ticker, period)
 
 
-@st.cache_data(ttl=30)
+@st.cache_data(ttl=3600)
+def fetch_info(ticker: str) -> dict:
+    return yf.Ticker(ticker).info
+
+
+@st.cache_data(ttl=15)
 def fetch_spot(ticker: str) -> float:
-    data = yf.Ticker(ticker).history(period='1d', interval='1m')
-    if not data.empty:
-        return float(data['Close'].iloc[-1])
-    daily = yf.Ticker(ticker).history(period='5d')
-    if not daily.empty:
-        return float(daily['Close'].iloc[-1])
-    info = yf.Ticker(ticker).info
+    stock = yf.Ticker(ticker)
+    # The current daily bar's close is the latest price; one bar instead of
+    # a day of 1m bars. 5 days covers weekends / holidays.
+    for period in ('1d', '5d'):
+        daily = stock.history(period=period)
+        if not daily.empty:
+            return float(daily['Close'].iloc[-1])
+    info = fetch_info(ticker)
     for key in ('currentPrice', 'regularMarketPrice', 'previousClose'):
         if info.get(key):
             return float(info[key])
     raise ValueError(f"Cannot determine price for {ticker}")
 
 
-@st.cache_data(ttl=120)
+@st.cache_data(ttl=60)
 def fetch_option_chain(ticker: str, expiry: str):
     """Return (calls_df, puts_df) as independent copies."""
-    chain = yf.Ticker(ticker).option_chain(expiry)
-    return chain.calls.copy(), chain.puts.copy()
+    calls_df, puts_df = _disk_cached(_chain_payload, CHAIN_DISK_TTL, ticker, expiry)
+    return calls_df.copy(), puts_df.copy()
 
 
-@st.cache_data(ttl=300)
+@st.cache_data(ttl=60)
+def fetch_strike_rows(ticker: str, expiry: str, option_type: str) -> dict:
+    """Map strike → contract row dict for O(1) lookup of the selected option."""
+    calls_df, puts_df = fetch_option_chain(ticker, expiry)
+    options_df = calls_df if option_type == "Call" else puts_df
+    return dict(zip(options_df['strike'].tolist(), options_df.to_dict('records')))
+
+
+@st.cache_data(ttl=60)
 def fetch_expiry_dates(ticker: str):
     return yf.Ticker(ticker).options
 
+
+prune_disk_cache()
+
+# ------------------------------------------------------------------ #
+#  Cached figure builders                                              #
+# ------------------------------------------------------------------ #
+
+def _hash_tail(df: pd.DataFrame) -> tuple:
+    """Cheap DataFrame key for figure caches — length plus the last row."""
+    return len(df), tuple(df.index[-1:].astype(str)), tuple(df.iloc[-1:].to_numpy().ravel())
+
+
+@st.cache_data(ttl=30, hash_funcs={pd.DataFrame: _hash_tail})
+def build_price_fig(hist_data: pd.DataFrame, ticker: str, strike_price: float) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=hist_data.index, y=hist_data['Close'],
+        mode='lines', name='Close Price',
+        line=dict(color=COLOURS['primary'], width=2)
+    ))
+    fig.add_hline(
+        y=strike_price, line_dash="dash", line_color=COLOURS['strike'],
+        annotation_text=f"Strike: ${strike_price}"
+    )
+    fig.update_layout(
+        title=f"{ticker} Price History (Last 3 Months)",
+        xaxis_title="Date", yaxis_title="Price ($)", height=400
+    )
+    return fig
+
+
+@st.cache_data(ttl=30, hash_funcs={pd.DataFrame: _hash_tail})
+def build_volume_fig(hist_data: pd.DataFrame) -> go.Figure:
+    fig = go.Figure(go.Bar(
+        x=hist_data.index, y=hist_data['Volume'],
+        name='Volume', marker_color=COLOURS['volume']
+    ))
+    fig.update_layout(
+        title="Trading Volume", xaxis_title="Date",
+        yaxis_title="Volume", height=200
+    )
+    return fig
+
+
+@st.cache_data(ttl=30)
+def build_sensitivity_fig(x_values: np.ndarray, prices: np.ndarray, current_x: float,
+                          current_price: float, option_type: str, param_label: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=x_values, y=prices, mode='lines',
+        name=f'{option_type} Price',
+        line=dict(color=COLOURS['secondary'], width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=[current_x], y=[current_price],
+        mode='markers', name='Current Value',
+        marker=dict(size=10, color=COLOURS['danger'])
+    ))
+    fig.update_layout(
+        title=f"Option Price vs {param_label}",
+        xaxis_title=param_label, yaxis_title="Option Price ($)", height=400
+    )
+    return fig
+
+
+@st.cache_data(ttl=30)
+def build_greek_sensitivity_fig(x_values: np.ndarray, greek_values: np.ndarray,
+                                greek: str, param_label: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=x_values, y=greek_values,
+        mode='lines', name=greek,
+        line=dict(color=COLOURS['primary'], width=3)
+    ))
+    fig.update_layout(
+        title=f"{greek} vs {param_label}",
+        xaxis_title=param_label, yaxis_title=greek, height=350
+    )
+    return fig
+
+
+@st.cache_data(ttl=30)
+def build_surface_fig(spot_range: np.ndarray, vol_range: np.ndarray, Z: np.ndarray,
+                      greek: str, option_type: str) -> go.Figure:
+    # 1-D axes are enough for go.Surface and keep the cache key small
+    fig = go.Figure(data=[go.Surface(
+        x=spot_range, y=vol_range, z=Z,
+        colorscale='Viridis',
+        colorbar=dict(title=greek)
+    )])
+    fig.update_layout(
+        title=f"{greek} Surface — {option_type}",
+        scene=dict(
+            xaxis_title="Spot Price ($)",
+            yaxis_title="Volatility",
+            zaxis_title=greek,
+        ),
+        height=550
+    )
+    return fig
+
+
+@st.cache_data(ttl=30)
+def build_payoff_fig(spot_range: np.ndarray, payoff: np.ndarray, profit_loss: np.ndarray,
+                     strike_price: float, spot_price: float, breakeven: float,
+                     option_type: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=spot_range, y=payoff,
+        mode='lines', name='Payoff',
+        line=dict(color=COLOURS['primary'], width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=spot_range, y=profit_loss,
+        mode='lines', name='Profit / Loss',
+        line=dict(color=COLOURS['secondary'], width=3, dash='dash')
+    ))
+    fig.add_hline(y=0, line_dash="dot", line_color=COLOURS['neutral'])
+    fig.add_vline(
+        x=strike_price, line_dash="dash", line_color=COLOURS['strike'],
+        annotation_text=f"Strike: ${strike_price}"
+    )
+    fig.add_vline(
+        x=spot_price, line_dash="dash", line_color=COLOURS['spot'],
+        annotation_text=f"Spot: ${spot_price:.2f}"
+    )
+    fig.add_vline(
+        x=breakeven, line_dash="dot", line_color=COLOURS['breakeven'],
+        annotation_text=f"Breakeven: ${breakeven:.2f}"
+    )
+    fig.update_layout(
+        title=f"{option_type} Option Payoff Diagram",
+        xaxis_title="Stock Price at Expiration ($)",
+        yaxis_title="Payoff / P&L ($)",
+        height=450, hovermode='x unified'
+    )
+    return fig
+
+
+@st.cache_data(ttl=30)
+def build_chain_fig(strikes: np.ndarray, delta: np.ndarray, gamma: np.ndarray,
+                    spot_price: float, option_type: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=strikes, y=delta, mode='lines+markers', name='Delta',
+        line=dict(color=COLOURS['primary'], width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=strikes, y=gamma, mode='lines+markers', name='Gamma', yaxis='y2',
+        line=dict(color=COLOURS['warning'], width=3)
+    ))
+    fig.add_vline(
+        x=spot_price, line_dash="dash", line_color=COLOURS['spot'],
+        annotation_text=f"Spot: ${spot_price:.2f}"
+    )
+    fig.update_layout(
+        title=f"{option_type} Delta & Gamma Across the Chain",
+        xaxis_title="Strike Price ($)", yaxis_title="Delta",
+        yaxis2=dict(title="Gamma", overlaying='y', side='right'),
+        height=450, hovermode='x unified'
+    )
+    return fig
+
+# ------------------------------------------------------------------ #
+#  Tab renderers — fragments, so a widget change reruns only its tab   #
+# ------------------------------------------------------------------ #
+
+@st.fragment
+def render_price_tab(hist_data: pd.DataFrame, ticker: str, strike_price: float) -> None:
+    st.plotly_chart(build_price_fig(hist_data, ticker, strike_price),
+                    use_container_width=True)
+    st.plotly_chart(build_volume_fig(hist_data), use_container_width=True)
+
+
+@st.fragment
+def render_sensitivity_tab(spot_price: float, strike_price: float, risk_free_rate: float,
+                           volatility: float, T: float, option_type: str,
+                           option_price: float) -> None:
+    sensitivity_param = st.selectbox(
+        "Parameter to analyse",
+        ["Spot Price", "Strike Price", "Volatility", "Time to Expiry"]
+    )
+    param_map = {
+        "Spot Price":    "spot",
+        "Strike Price":  "strike",
+        "Volatility":    "volatility",
+        "Time to Expiry":"time",
+    }
+
+    x_values, prices, greeks_sens = BlackScholesModel.generate_sensitivity_data(
+        spot_price, strike_price, risk_free_rate, volatility, T,
+        option_type.lower(), param=param_map[sensitivity_param]
+    )
+
+    current_x_map = {
+        "spot": spot_price, "strike": strike_price,
+        "volatility": volatility, "time": T
+    }
+    current_x = current_x_map[param_map[sensitivity_param]]
+
+    st.plotly_chart(build_sensitivity_fig(
+        x_values, prices, current_x, option_price,
+        option_type, sensitivity_param
+    ), use_container_width=True)
+
+    st.subheader("Greeks Sensitivity")
+    greek_choice = st.selectbox("Select Greek", ["Delta", "Gamma", "Vega", "Theta", "Rho"])
+    st.plotly_chart(build_greek_sensitivity_fig(
+        x_values, greeks_sens[greek_choice.lower()], greek_choice, sensitivity_param
+    ), use_container_width=True)
+
+
+@st.fragment
+def render_surface_tab(spot_price: float, strike_price: float, risk_free_rate: float,
+                       volatility: float, T: float, option_type: str) -> None:
+    st.subheader("Greeks 3D Surface")
+    greek_surface = st.selectbox(
+        "Greek for 3D plot", ["Delta", "Gamma", "Vega", "Theta"]
+    )
+
+    # float32 is ample at plot resolution and halves the grid's footprint
+    spot_range = np.linspace(spot_price * 0.7, spot_price * 1.3, 40, dtype=np.float32)
+    vol_range  = np.linspace(max(volatility * 0.4, 0.01), volatility * 2.0, 40,
+                             dtype=np.float32)
+
+    # Rows follow volatility, columns follow spot
+    fast_paths = {
+        'Delta': BlackScholesModel.calculate_delta,
+        'Gamma': BlackScholesModel.calculate_gamma,
+        'Vega':  BlackScholesModel.calculate_vega,
+    }
+    if greek_surface in fast_paths:
+        # Single-Greek kernel over the broadcast axes; log(S/K) depends only on
+        # spot, so it is taken once per column and shared by every vol row
+        log_m = np.log(spot_range / strike_price)
+        Z = fast_paths[greek_surface](
+            spot_range[np.newaxis, :], strike_price, risk_free_rate,
+            vol_range[:, np.newaxis], T, option_type.lower(),
+            log_moneyness=log_m[np.newaxis, :]
+        )
+    else:
+        # One compiled pass over the grid spanned by the two axes
+        Z = bs_numba.calculate_greeks_grid(
+            spot_range, vol_range, strike_price, risk_free_rate, T, option_type.lower()
+        )[greek_surface.lower()]
+
+    st.plotly_chart(build_surface_fig(spot_range, vol_range, Z, greek_surface, option_type),
+                    use_container_width=True)
+
+
+@st.fragment
+def render_payoff_tab(spot_price: float, strike_price: float, option_price: float,
+                      option_type: str) -> None:
+    st.subheader("Option Payoff at Expiration")
+
+    spot_range_payoff = np.linspace(spot_price * 0.5, spot_price * 1.5, 200,
+                                    dtype=np.float32)
+    if option_type.lower() == 'call':
+        payoff = np.maximum(spot_range_payoff - strike_price, 0)
+        breakeven = strike_price + option_price
+        max_profit_label = "Unlimited"
+    else:
+        payoff = np.maximum(strike_price - spot_range_payoff, 0)
+        breakeven = strike_price - option_price
+        max_profit_label = f"${strike_price - option_price:.2f}"
+
+    profit_loss = payoff - option_price
+
+    st.plotly_chart(build_payoff_fig(
+        spot_range_payoff, payoff, profit_loss,
+        strike_price, spot_price, breakeven, option_type
+    ), use_container_width=True)
+
+    p1, p2, p3 = st.columns(3)
+    p1.metric("Breakeven Price", f"${breakeven:.2f}")
+    p2.metric("Max Loss",        f"${option_price:.2f} per contract")
+    p3.metric("Max Profit",      max_profit_label)
+
+
+@st.fragment
+def render_chain_tab(ticker: str, expiry: str, spot_price: float,
+                     risk_free_rate: float, T: float, option_type: str) -> None:
+    st.subheader("Greeks Across the Option Chain")
+    if expiry is None:
+        st.info("No option chain available for this ticker.")
+        return
+
+    calls_df, puts_df = fetch_option_chain(ticker, expiry)
+    chain = calls_df if option_type == "Call" else puts_df
+    chain = chain[chain['impliedVolatility'] > 0]
+
+    strikes = chain['strike'].to_numpy(dtype=float)
+    # Single vectorised call over every strike, each with its own market IV
+    chain_greeks = BlackScholesModel.calculate_greeks_vec(
+        spot_price, strikes, risk_free_rate,
+        chain['impliedVolatility'].to_numpy(dtype=float), T, option_type.lower()
+    )
+
+    st.plotly_chart(build_chain_fig(
+        strikes, chain_greeks['delta'], chain_greeks['gamma'], spot_price, option_type
+    ), use_container_width=True)
+
 # ------------------------------------------------------------------ #
 #  Sidebar                                                             #
 # ------------------------------------------------------------------ #
@@ -84,11 +475,23 @@ with st.sidebar:
     ticker = st.text_input("Stock Ticker", value="AAPL",
                            help="Enter stock symbol (e.g., AAPL, TSLA)").upper().strip()
 
+# ---- Prefetch: the ticker's independent network calls, overlapped -- #
+# Workers inherit the script context so the cached fetchers behave as on
+# the main thread; each fetcher builds its own yf.Ticker. Leaving the
+# block waits for all three, and .result() re-raises where each is used.
+
+with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx,
+                        initargs=(None, get_script_run_ctx())) as pool:
+    expiry_future = pool.submit(fetch_expiry_dates, ticker)
+    spot_future   = pool.submit(fetch_spot, ticker)
+    hist_future   = pool.submit(fetch_price_history, ticker)
+
+with st.sidebar:
     # ---- expiry / strike selection --------------------------------- #
     option_type = st.radio("Option Type", ["Call", "Put"])
 
     try:
-        expiry_dates = fetch_expiry_dates(ticker)
+        expiry_dates = expiry_future.result()
     except Exception:
         expiry_dates = ()
 
@@ -97,20 +500,28 @@ with st.sidebar:
         expiration_date = datetime.strptime(expiration_date_str, '%Y-%m-%d').date()
 
         try:
-            spot_price_sidebar = fetch_spot(ticker)
+            spot_price_sidebar = spot_future.result()
         except Exception:
             spot_price_sidebar = 100.0
 
-        calls_df, puts_df = fetch_option_chain(ticker, expiration_date_str)
-        options_df = calls_df if option_type == "Call" else puts_df
-
-        available_strikes = sorted(options_df['strike'].unique())
-        atm_idx = min(range(len(available_strikes)),
-                      key=lambda i: abs(available_strikes[i] - spot_price_sidebar))
+        strike_rows = fetch_strike_rows(ticker, expiration_date_str, option_type)
+
+        available_strikes = sorted(strike_rows)
+        # Strikes are sorted, so the ATM strike is one of the two neighbours
+        # of the spot's insertion point
+        strikes_arr = np.asarray(available_strikes)
+        atm_idx = int(np.searchsorted(strikes_arr, spot_price_sidebar))
+        if atm_idx == len(strikes_arr):
+            atm_idx -= 1
+        elif atm_idx > 0:
+            below = spot_price_sidebar - strikes_arr[atm_idx - 1]
+            above = strikes_arr[atm_idx] - spot_price_sidebar
+            if below <= above:
+                atm_idx -= 1
 
         strike_price = st.selectbox("Strike Price ($)", available_strikes, index=atm_idx)
 
-        selected_option = options_df[options_df['strike'] == strike_price].iloc[0]
+        selected_option = strike_rows[strike_price]
         last_price   = max(0.0, float(selected_option.get('lastPrice', 0) or 0))
         bid          = max(0.0, float(selected_option.get('bid', 0) or 0))
         ask          = max(0.0, float(selected_option.get('ask', 0) or 0))
@@ -151,6 +562,8 @@ with st.sidebar:
                                           help="Rolling window for historical volatility")
     auto_refresh        = st.checkbox("Auto-refresh (every 30 s)")
     if auto_refresh:
+        # Client-side timer — triggers a rerun without blocking the script thread
+        st_autorefresh(interval=30_000, key="refresher")
         st.caption("⚡ Auto-refresh enabled")
 
 # ------------------------------------------------------------------ #
@@ -161,14 +574,14 @@ st.title("📈 Black-Scholes Option Pricing Model")
 st.markdown("### Real-time option pricing with Greeks calculation")
 
 try:
-    spot_price = fetch_spot(ticker)
-    hist_data  = fetch_price_history(ticker)
+    spot_price = spot_future.result()
+    hist_data  = hist_future.result()
 
     T = BlackScholesModel.calculate_time_to_expiry(
         datetime.combine(expiration_date, datetime.min.time())
     )
 
-    option_price = BlackScholesModel.calculate_option_price(
+    option_price, greeks = bs_numba.calculate_price_and_greeks(
         spot_price, strike_price, risk_free_rate, volatility, T,
         option_type.lower()
     )
@@ -176,10 +589,6 @@ try:
     hist_vol    = BlackScholesModel.calculate_historical_volatility(
         hist_data['Close'], window=hist_vol_window
     )
-    greeks = BlackScholesModel.calculate_greeks(
-        spot_price, strike_price, risk_free_rate, volatility, T,
-        option_type.lower()
-    )
 
     # ---- Key metrics row ------------------------------------------ #
     m1, m2, m3, m4, m5 = st.columns(5)
@@ -187,7 +596,9 @@ try:
     m2.metric("Days to Expiry",     f"{max(int(T * 365), 0)}")
     m3.metric(f"{option_type} Price", f"${float(option_price):.4f}")
     m4.metric("Total Value",        f"${total_value:,.2f}")
-    m5.metric("Historical Vol.",    f"{hist_vol * 100:.1f}%")
+    m5.metric("Historical Vol.",    f"{hist_vol * 100:.1f}%",
+              help=None if len(hist_data) > hist_vol_window else
+              f"Only {len(hist_data)} prices for a {hist_vol_window}-day window — 20% default")
 
     st.divider()
 
@@ -211,184 +622,24 @@ try:
     #  Tabs                                                             #
     # ---------------------------------------------------------------- #
     st.subheader("📊 Analysis & Visualisation")
-    tab1, tab2, tab3, tab4 = st.tabs(
-        ["Price History", "Sensitivity Analysis", "Greeks Surface", "Payoff Diagram"]
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["Price History", "Sensitivity Analysis", "Greeks Surface", "Payoff Diagram",
+         "Chain Greeks"]
     )
 
-    # ---- Tab 1: Price History ------------------------------------- #
     with tab1:
-        fig_price = go.Figure()
-        fig_price.add_trace(go.Scatter(
-            x=hist_data.index, y=hist_data['Close'],
-            mode='lines', name='Close Price',
-            line=dict(color=COLOURS['primary'], width=2)
-        ))
-        fig_price.add_hline(
-            y=strike_price, line_dash="dash", line_color=COLOURS['strike'],
-            annotation_text=f"Strike: ${strike_price}"
-        )
-        fig_price.update_layout(
-            title=f"{ticker} Price History (Last 3 Months)",
-            xaxis_title="Date", yaxis_title="Price ($)", height=400
-        )
-        st.plotly_chart(fig_price, use_container_width=True)
-
-        fig_vol = go.Figure(go.Bar(
-            x=hist_data.index, y=hist_data['Volume'],
-            name='Volume', marker_color=COLOURS['volume']
-        ))
-        fig_vol.update_layout(
-            title="Trading Volume", xaxis_title="Date",
-            yaxis_title="Volume", height=200
-        )
-        st.plotly_chart(fig_vol, use_container_width=True)
-
-    # ---- Tab 2: Sensitivity --------------------------------------- #
+        render_price_tab(hist_data, ticker, strike_price)
     with tab2:
-        sensitivity_param = st.selectbox(
-            "Parameter to analyse",
-            ["Spot Price", "Strike Price", "Volatility", "Time to Expiry"]
-        )
-        param_map = {
-            "Spot Price":    "spot",
-            "Strike Price":  "strike",
-            "Volatility":    "volatility",
-            "Time to Expiry":"time",
-        }
-
-        x_values, prices, greeks_sens = BlackScholesModel.generate_sensitivity_data(
-            spot_price, strike_price, risk_free_rate, volatility, T,
-            option_type.lower(), param=param_map[sensitivity_param]
-        )
-
-        current_x_map = {
-            "spot": spot_price, "strike": strike_price,
-            "volatility": volatility, "time": T
-        }
-        current_x = current_x_map[param_map[sensitivity_param]]
-
-        fig_sens = go.Figure()
-        fig_sens.add_trace(go.Scatter(
-            x=x_values, y=prices, mode='lines',
-            name=f'{option_type} Price',
-            line=dict(color=COLOURS['secondary'], width=3)
-        ))
-        fig_sens.add_trace(go.Scatter(
-            x=[current_x], y=[float(option_price)],
-            mode='markers', name='Current Value',
-            marker=dict(size=10, color=COLOURS['danger'])
-        ))
-        fig_sens.update_layout(
-            title=f"Option Price vs {sensitivity_param}",
-            xaxis_title=sensitivity_param, yaxis_title="Option Price ($)", height=400
-        )
-        st.plotly_chart(fig_sens, use_container_width=True)
-
-        st.subheader("Greeks Sensitivity")
-        greek_choice = st.selectbox("Select Greek", ["Delta", "Gamma", "Vega", "Theta", "Rho"])
-        fig_greek = go.Figure()
-        fig_greek.add_trace(go.Scatter(
-            x=x_values, y=greeks_sens[greek_choice.lower()],
-            mode='lines', name=greek_choice,
-            line=dict(color=COLOURS['primary'], width=3)
-        ))
-        fig_greek.update_layout(
-            title=f"{greek_choice} vs {sensitivity_param}",
-            xaxis_title=sensitivity_param, yaxis_title=greek_choice, height=350
-        )
-        st.plotly_chart(fig_greek, use_container_width=True)
-
-    # ---- Tab 3: 3D Greeks Surface --------------------------------- #
+        render_sensitivity_tab(spot_price, strike_price, risk_free_rate, volatility, T,
+                               option_type, float(option_price))
     with tab3:
-        st.subheader("Greeks 3D Surface")
-        greek_surface = st.selectbox(
-            "Greek for 3D plot", ["Delta", "Gamma", "Vega", "Theta"]
-        )
-
-        spot_range = np.linspace(spot_price * 0.7, spot_price * 1.3, 40)
-        vol_range  = np.linspace(max(volatility * 0.4, 0.01), volatility * 2.0, 40)
-        S_grid, vol_grid = np.meshgrid(spot_range, vol_range)
-
-        # Single vectorised call — replaces 1,600-iteration nested loop
-        grid_greeks = BlackScholesModel.calculate_greeks_grid(
-            S_grid, vol_grid, strike_price, risk_free_rate, T, option_type.lower()
-        )
-        Z = grid_greeks[greek_surface.lower()]
-
-        fig_3d = go.Figure(data=[go.Surface(
-            x=S_grid, y=vol_grid, z=Z,
-            colorscale='Viridis',
-            colorbar=dict(title=greek_surface)
-        )])
-        fig_3d.update_layout(
-            title=f"{greek_surface} Surface — {option_type}",
-            scene=dict(
-                xaxis_title="Spot Price ($)",
-                yaxis_title="Volatility",
-                zaxis_title=greek_surface,
-            ),
-            height=550
-        )
-        st.plotly_chart(fig_3d, use_container_width=True)
-
-    # ---- Tab 4: Payoff -------------------------------------------- #
+        render_surface_tab(spot_price, strike_price, risk_free_rate, volatility, T,
+                           option_type)
     with tab4:
-        st.subheader("Option Payoff at Expiration")
-
-        spot_range_payoff = np.linspace(spot_price * 0.5, spot_price * 1.5, 200)
-        if option_type.lower() == 'call':
-            payoff = np.maximum(spot_range_payoff - strike_price, 0)
-            breakeven = strike_price + float(option_price)
-            max_profit_label = "Unlimited"
-        else:
-            payoff = np.maximum(strike_price - spot_range_payoff, 0)
-            breakeven = strike_price - float(option_price)
-            max_profit_label = f"${strike_price - float(option_price):.2f}"
-
-        profit_loss = payoff - float(option_price)
-
-        fig_payoff = go.Figure()
-        fig_payoff.add_trace(go.Scatter(
-            x=spot_range_payoff, y=payoff,
-            mode='lines', name='Payoff',
-            line=dict(color=COLOURS['primary'], width=3)
-        ))
-        fig_payoff.add_trace(go.Scatter(
-            x=spot_range_payoff, y=profit_loss,
-            mode='lines', name='Profit / Loss',
-            line=dict(color=COLOURS['secondary'], width=3, dash='dash')
-        ))
-        fig_payoff.add_hline(y=0, line_dash="dot", line_color=COLOURS['neutral'])
-        fig_payoff.add_vline(
-            x=strike_price, line_dash="dash", line_color=COLOURS['strike'],
-            annotation_text=f"Strike: ${strike_price}"
-        )
-        fig_payoff.add_vline(
-            x=spot_price, line_dash="dash", line_color=COLOURS['spot'],
-            annotation_text=f"Spot: ${spot_price:.2f}"
-        )
-        fig_payoff.add_vline(
-            x=breakeven, line_dash="dot", line_color=COLOURS['breakeven'],
-            annotation_text=f"Breakeven: ${breakeven:.2f}"
-        )
-        fig_payoff.update_layout(
-            title=f"{option_type} Option Payoff Diagram",
-            xaxis_title="Stock Price at Expiration ($)",
-            yaxis_title="Payoff / P&L ($)",
-            height=450, hovermode='x unified'
-        )
-        st.plotly_chart(fig_payoff, use_container_width=True)
-
-        p1, p2, p3 = st.columns(3)
-        p1.metric("Breakeven Price", f"${breakeven:.2f}")
-        p2.metric("Max Loss",        f"${float(option_price):.2f} per contract")
-        p3.metric("Max Profit",      max_profit_label)
-
-    # ---- Auto-refresh -------------------------------------------- #
-    if auto_refresh:
-        import time
-        time.sleep(30)
-        st.rerun()
+        render_payoff_tab(spot_price, strike_price, float(option_price), option_type)
+    with tab5:
+        render_chain_tab(ticker, expiration_date_str, spot_price, risk_free_rate, T,
+                         option_type)
 
 except Exception as e:
     st.error(f"Error: {e}")
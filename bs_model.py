@@ -4,11 +4,36 @@ Contains all pricing and Greeks calculation functions.
 All core functions are numpy-vectorised — they accept scalars or arrays.
 """
 
+import math
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 from datetime import datetime
 
 
+_SQRT_2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+
+def _norm_cdf(x):
+    """Standard normal CDF — math.erf for scalars, raw ndtr ufunc for arrays."""
+    if np.ndim(x) == 0:
+        return 0.5 * (1.0 + math.erf(float(x) / _SQRT_2))
+    return ndtr(x)
+
+
+def _norm_pdf(x):
+    """Standard normal PDF — math.exp for scalars, np.exp for arrays."""
+    if np.ndim(x) == 0:
+        x = float(x)
+        return math.exp(-0.5 * x * x) / _SQRT_2PI
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def _scalar(x):
+    """0-d results as Python floats — NumPy float64 scalars would upcast float32 arrays."""
+    return float(x) if np.ndim(x) == 0 else x
+
+
 class BlackScholesModel:
     """Black-Scholes-Merton model for European option pricing with dividend yield support."""
 
@@ -23,7 +48,12 @@ class BlackScholesModel:
         return max(days / 365.0, 1 / 365)
 
     @staticmethod
-    def calculate_d1_d2(S, K, r, sigma, T, q=0.0):
+    def _d1_from_logm(log_m, r, sigma, T, sigma_sqrt_T, q=0.0):
+        """d1 from a precomputed log-moneyness log(S/K) and sigma * sqrt(T)."""
+        return (log_m + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+
+    @staticmethod
+    def calculate_d1_d2(S, K, r, sigma, T, q=0.0, log_moneyness=None):
         """
         Vectorised d1/d2 calculation. S and sigma may be scalars or numpy arrays.
 
@@ -34,12 +64,20 @@ class BlackScholesModel:
             sigma : Volatility (scalar or array)
             T     : Time to expiry in years (scalar)
             q     : Continuous dividend yield (scalar, default 0)
+            log_moneyness : Optional precomputed log(S/K). Pass it when only
+                            sigma / T vary, so the log is not re-evaluated.
+
+        Returns:
+            (d1, d2, sqrt_T) — sqrt_T is returned so callers don't recompute it
         """
-        S = np.maximum(S, 1e-8)
+        if log_moneyness is None:
+            log_moneyness = np.log(np.maximum(S, 1e-8) / K)
         sigma = np.maximum(sigma, 1e-8)
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        return d1, d2
+        sqrt_T = _scalar(np.sqrt(T))
+        sigma_sqrt_T = sigma * sqrt_T
+        d1 = BlackScholesModel._d1_from_logm(log_moneyness, r, sigma, T, sigma_sqrt_T, q)
+        d2 = d1 - sigma_sqrt_T
+        return d1, d2, sqrt_T
 
     # ------------------------------------------------------------------ #
     #  Pricing                                                             #
@@ -62,14 +100,14 @@ class BlackScholesModel:
         Returns:
             Option price (same shape as S / sigma inputs)
         """
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S, K, r, sigma, T, q)
-        disc = np.exp(-r * T)
-        S_disc = S * np.exp(-q * T)
+        d1, d2, _ = BlackScholesModel.calculate_d1_d2(S, K, r, sigma, T, q)
+        K_disc = K * _scalar(np.exp(-r * T))
+        S_disc = S * _scalar(np.exp(-q * T))
 
-        if option_type.lower() == 'call':
-            price = S_disc * norm.cdf(d1) - K * disc * norm.cdf(d2)
-        else:
-            price = K * disc * norm.cdf(-d2) - S_disc * norm.cdf(-d1)
+        price = S_disc * _norm_cdf(d1) - K_disc * _norm_cdf(d2)
+        if option_type.lower() != 'call':
+            # Put-call parity — reuses the call's CDF pair
+            price = price - S_disc + K_disc
 
         return np.maximum(price, 0.0)
 
@@ -80,88 +118,56 @@ class BlackScholesModel:
     @staticmethod
     def calculate_greeks(S, K, r, sigma, T, option_type='call', q=0.0):
         """
-        Calculate all Greeks for a single option (scalar inputs).
+        Calculate all Greeks. Vectorised — S and sigma may be scalars or numpy
+        arrays of any broadcast-compatible shape (e.g. a spot × vol meshgrid).
 
         Returns:
-            dict with keys: delta, gamma, vega, theta, rho
+            dict with keys: delta, gamma, vega, theta, rho.
+            Values are floats for scalar inputs, numpy arrays otherwise.
         """
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S, K, r, sigma, T, q)
-
-        sqrt_T = np.sqrt(T)
-        exp_neg_rT = np.exp(-r * T)
-        exp_neg_qT = np.exp(-q * T)
-        n_prime_d1 = norm.pdf(d1)
-
-        gamma = n_prime_d1 * exp_neg_qT / (S * sigma * sqrt_T)
-        vega = S * exp_neg_qT * n_prime_d1 * sqrt_T / 100   # per 1% vol move
-
-        if option_type.lower() == 'call':
-            delta = exp_neg_qT * norm.cdf(d1)
-            theta = (
-                -S * exp_neg_qT * n_prime_d1 * sigma / (2 * sqrt_T)
-                - r * K * exp_neg_rT * norm.cdf(d2)
-                + q * S * exp_neg_qT * norm.cdf(d1)
-            ) / 365
-            rho = K * T * exp_neg_rT * norm.cdf(d2) / 100
-        else:
-            delta = exp_neg_qT * (norm.cdf(d1) - 1)
-            theta = (
-                -S * exp_neg_qT * n_prime_d1 * sigma / (2 * sqrt_T)
-                + r * K * exp_neg_rT * norm.cdf(-d2)
-                - q * S * exp_neg_qT * norm.cdf(-d1)
-            ) / 365
-            rho = -K * T * exp_neg_rT * norm.cdf(-d2) / 100
-
-        return {
-            'delta': float(delta),
-            'gamma': float(gamma),
-            'vega':  float(vega),
-            'theta': float(theta),
-            'rho':   float(rho),
-        }
+        _, greeks = BlackScholesModel.calculate_price_and_greeks(
+            S, K, r, sigma, T, option_type, q
+        )
+        return greeks
 
     @staticmethod
-    def calculate_greeks_grid(S_grid, vol_grid, K, r, T, option_type='call', q=0.0):
+    def calculate_price_and_greeks(S, K, r, sigma, T, option_type='call', q=0.0):
         """
-        Vectorised Greeks over a 2-D meshgrid of spot prices × volatilities.
-        Used for the 3-D surface plot — replaces the nested Python loop.
-
-        Parameters:
-            S_grid   : 2-D numpy array of spot prices (from np.meshgrid)
-            vol_grid : 2-D numpy array of volatilities (from np.meshgrid)
-            K, r, T, option_type, q : scalar BSM parameters
+        Fused price + Greeks. d1/d2, the discount factors, N(d1), N(d2) and
+        N'(d1) are evaluated once and shared by the price and every Greek.
 
         Returns:
-            dict mapping Greek name → 2-D numpy array (same shape as S_grid)
+            (price, greeks_dict) — floats for scalar inputs, arrays otherwise
         """
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S_grid, K, r, vol_grid, T, q)
+        d1, d2, sqrt_T = BlackScholesModel.calculate_d1_d2(S, K, r, sigma, T, q)
+
+        exp_neg_rT = _scalar(np.exp(-r * T))
+        exp_neg_qT = _scalar(np.exp(-q * T))
+        n_prime_d1 = _norm_pdf(d1)
 
-        sqrt_T = np.sqrt(T)
-        exp_neg_rT = np.exp(-r * T)
-        exp_neg_qT = np.exp(-q * T)
-        n_prime_d1 = norm.pdf(d1)
+        gamma = n_prime_d1 * exp_neg_qT / (S * sigma * sqrt_T)
+        vega = S * exp_neg_qT * n_prime_d1 * sqrt_T / 100   # per 1% vol move
+        decay = -S * exp_neg_qT * n_prime_d1 * sigma / (2 * sqrt_T)
 
-        gamma = n_prime_d1 * exp_neg_qT / (S_grid * vol_grid * sqrt_T)
-        vega  = S_grid * exp_neg_qT * n_prime_d1 * sqrt_T / 100
+        # Call CDFs are always needed; the put's follow from N(-x) = 1 - N(x)
+        Nd1 = _norm_cdf(d1)
+        Nd2 = _norm_cdf(d2)
 
         if option_type.lower() == 'call':
-            delta = exp_neg_qT * norm.cdf(d1)
-            theta = (
-                -S_grid * exp_neg_qT * n_prime_d1 * vol_grid / (2 * sqrt_T)
-                - r * K * exp_neg_rT * norm.cdf(d2)
-                + q * S_grid * exp_neg_qT * norm.cdf(d1)
-            ) / 365
-            rho = K * T * exp_neg_rT * norm.cdf(d2) / 100
+            price = S * exp_neg_qT * Nd1 - K * exp_neg_rT * Nd2
+            delta = exp_neg_qT * Nd1
+            theta = (decay - r * K * exp_neg_rT * Nd2 + q * S * exp_neg_qT * Nd1) / 365
+            rho = K * T * exp_neg_rT * Nd2 / 100
         else:
-            delta = exp_neg_qT * (norm.cdf(d1) - 1)
-            theta = (
-                -S_grid * exp_neg_qT * n_prime_d1 * vol_grid / (2 * sqrt_T)
-                + r * K * exp_neg_rT * norm.cdf(-d2)
-                - q * S_grid * exp_neg_qT * norm.cdf(-d1)
-            ) / 365
-            rho = -K * T * exp_neg_rT * norm.cdf(-d2) / 100
-
-        return {
+            Nmd1 = 1.0 - Nd1
+            Nmd2 = 1.0 - Nd2
+            price = K * exp_neg_rT * Nmd2 - S * exp_neg_qT * Nmd1
+            delta = -exp_neg_qT * Nmd1
+            theta = (decay + r * K * exp_neg_rT * Nmd2 - q * S * exp_neg_qT * Nmd1) / 365
+            rho = -K * T * exp_neg_rT * Nmd2 / 100
+
+        price = np.maximum(price, 0.0)
+        greeks = {
             'delta': delta,
             'gamma': gamma,
             'vega':  vega,
@@ -169,6 +175,72 @@ class BlackScholesModel:
             'rho':   rho,
         }
 
+        # Scalar in → plain floats out, so callers can format them directly
+        return _scalar(price), {
+            name: _scalar(value) for name, value in greeks.items()
+        }
+
+    # Single-Greek fast paths — when only one Greek is displayed (e.g. the
+    # 3-D surface) these skip the CDF / PDF evaluations the others need.
+    # log_moneyness is forwarded to calculate_d1_d2 when log(S/K) is known.
+
+    @staticmethod
+    def calculate_delta(S, K, r, sigma, T, option_type='call', q=0.0,
+                        log_moneyness=None):
+        """Delta only — needs N(d1) alone. Vectorised like calculate_greeks."""
+        d1, _, _ = BlackScholesModel.calculate_d1_d2(
+            S, K, r, sigma, T, q, log_moneyness
+        )
+        Nd1 = _norm_cdf(d1)
+        exp_neg_qT = _scalar(np.exp(-q * T))
+        if option_type.lower() == 'call':
+            delta = exp_neg_qT * Nd1
+        else:
+            delta = -exp_neg_qT * (1.0 - Nd1)
+        return _scalar(delta)
+
+    @staticmethod
+    def calculate_gamma(S, K, r, sigma, T, option_type='call', q=0.0,
+                        log_moneyness=None):
+        """Gamma only — needs N'(d1) alone; identical for calls and puts."""
+        d1, _, sqrt_T = BlackScholesModel.calculate_d1_d2(
+            S, K, r, sigma, T, q, log_moneyness
+        )
+        gamma = _norm_pdf(d1) * _scalar(np.exp(-q * T)) / (S * sigma * sqrt_T)
+        return _scalar(gamma)
+
+    @staticmethod
+    def calculate_vega(S, K, r, sigma, T, option_type='call', q=0.0,
+                       log_moneyness=None):
+        """Vega only (per 1% vol move) — needs N'(d1) alone; identical for calls and puts."""
+        d1, _, sqrt_T = BlackScholesModel.calculate_d1_d2(
+            S, K, r, sigma, T, q, log_moneyness
+        )
+        vega = S * _scalar(np.exp(-q * T)) * _norm_pdf(d1) * sqrt_T / 100
+        return _scalar(vega)
+
+    @staticmethod
+    def calculate_greeks_vec(S, K_arr, r, sigma_arr, T, option_type='call', q=0.0):
+        """
+        Price and Greeks across an option chain slice in one vectorised pass —
+        d1/d2 are evaluated for every strike at once, no per-strike loop.
+
+        Parameters:
+            S         : Spot price (scalar)
+            K_arr     : Strike prices (array)
+            sigma_arr : Implied volatility per strike (array, same shape as K_arr)
+            r, T, option_type, q : scalar BSM parameters
+
+        Returns:
+            dict with keys: price, delta, gamma, vega, theta, rho → numpy arrays
+        """
+        K_arr = np.asarray(K_arr, dtype=float)
+        sigma_arr = np.asarray(sigma_arr, dtype=float)
+        price, greeks = BlackScholesModel.calculate_price_and_greeks(
+            S, K_arr, r, sigma_arr, T, option_type, q
+        )
+        return {'price': price, **greeks}
+
     # ------------------------------------------------------------------ #
     #  Historical volatility                                               #
     # ------------------------------------------------------------------ #
@@ -179,16 +251,23 @@ class BlackScholesModel:
         Annualised historical volatility using log returns (more accurate than
         simple percentage returns, especially over longer windows).
 
+        Only the most recent window is evaluated — one np.std over the last
+        `window` log returns instead of a full rolling series.
+
         Parameters:
-            price_data : pd.Series of closing prices
-            window     : Rolling window in trading days
+            price_data : pd.Series or array of closing prices
+            window     : Window length in trading days
 
         Returns:
-            float: Most recent annualised HV estimate
+            float: Most recent annualised HV estimate (0.20 if fewer than
+            window + 1 prices)
         """
-        log_returns = np.log(price_data / price_data.shift(1)).dropna()
-        hv_series = log_returns.rolling(window=window).std() * np.sqrt(252)
-        return float(hv_series.iloc[-1]) if len(hv_series) > 0 else 0.20
+        prices = np.asarray(price_data, dtype=float)
+        if window < 2 or prices.size < window + 1:
+            return 0.20
+        prices = prices[-(window + 1):]
+        log_returns = np.log(prices[1:] / prices[:-1])
+        return float(np.std(log_returns, ddof=1) * np.sqrt(252))
 
     # ------------------------------------------------------------------ #
     #  Sensitivity data (fully vectorised — no Python loop)               #
@@ -222,42 +301,8 @@ class BlackScholesModel:
         else:
             raise ValueError(f"Unknown param: {param}")
 
-        prices = BlackScholesModel.calculate_option_price(
+        prices, greeks_dict = BlackScholesModel.calculate_price_and_greeks(
             S_arr, K_arr, r, sigma_arr, T_arr, option_type, q
         )
 
-        d1, d2 = BlackScholesModel.calculate_d1_d2(S_arr, K_arr, r, sigma_arr, T_arr, q)
-        sqrt_T = np.sqrt(T_arr)
-        exp_neg_rT = np.exp(-r * T_arr)
-        exp_neg_qT = np.exp(-q * T_arr)
-        n_prime_d1 = norm.pdf(d1)
-
-        gamma = n_prime_d1 * exp_neg_qT / (np.maximum(S_arr, 1e-8) * np.maximum(sigma_arr, 1e-8) * sqrt_T)
-        vega  = np.maximum(S_arr, 1e-8) * exp_neg_qT * n_prime_d1 * sqrt_T / 100
-
-        if option_type.lower() == 'call':
-            delta = exp_neg_qT * norm.cdf(d1)
-            theta = (
-                -np.maximum(S_arr, 1e-8) * exp_neg_qT * n_prime_d1 * np.maximum(sigma_arr, 1e-8) / (2 * sqrt_T)
-                - r * K_arr * exp_neg_rT * norm.cdf(d2)
-                + q * np.maximum(S_arr, 1e-8) * exp_neg_qT * norm.cdf(d1)
-            ) / 365
-            rho = K_arr * T_arr * exp_neg_rT * norm.cdf(d2) / 100
-        else:
-            delta = exp_neg_qT * (norm.cdf(d1) - 1)
-            theta = (
-                -np.maximum(S_arr, 1e-8) * exp_neg_qT * n_prime_d1 * np.maximum(sigma_arr, 1e-8) / (2 * sqrt_T)
-                + r * K_arr * exp_neg_rT * norm.cdf(-d2)
-                - q * np.maximum(S_arr, 1e-8) * exp_neg_qT * norm.cdf(-d1)
-            ) / 365
-            rho = -K_arr * T_arr * exp_neg_rT * norm.cdf(-d2) / 100
-
-        greeks_dict = {
-            'delta': delta,
-            'gamma': gamma,
-            'vega':  vega,
-            'theta': theta,
-            'rho':   rho,
-        }
-
         return x_values, prices, greeks_dict
@@ -0,0 +1,175 @@
+"""
+Numba-compiled Black-Scholes kernels
+Scalar price + Greeks for the dashboard's headline metrics, which are
+recomputed on every Streamlit rerun, and a grid kernel for the
+3-D surface. Results match BlackScholesModel.
+"""
+
+import math
+import numpy as np
+from numba import njit
+
+
+_SQRT_2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+
+# ------------------------------------------------------------------ #
+#  Kernels                                                             #
+# ------------------------------------------------------------------ #
+
+@njit(cache=True, fastmath=True)
+def _norm_cdf(x):
+    return 0.5 * (1.0 + math.erf(x / _SQRT_2))
+
+
+@njit(cache=True, fastmath=True)
+def _norm_pdf(x):
+    return math.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+@njit(cache=True, fastmath=True)
+def _d1_from_logm(log_m, r, sigma, T, sigma_sqrt_T, q):
+    """d1 from a precomputed log-moneyness log(S/K) and sigma * sqrt(T)."""
+    return (log_m + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrt_T
+
+
+@njit(cache=True, fastmath=True)
+def _bs_greeks_scalar(S, K, r, sigma, T, is_call, q):
+    """Price and Greeks for a single option as (price, delta, gamma, vega, theta, rho)."""
+    S = max(S, 1e-8)
+    return _bs_greeks_logm(S, math.log(S / K), K, r, sigma, T, is_call, q)
+
+
+@njit(cache=True, fastmath=True)
+def _bs_greeks_logm(S, log_m, K, r, sigma, T, is_call, q):
+    """As _bs_greeks_scalar, with log(S/K) supplied by the caller (S already floored)."""
+    sigma = max(sigma, 1e-8)
+    sqrt_T = math.sqrt(T)
+    sigma_sqrt_T = sigma * sqrt_T
+    d1 = _d1_from_logm(log_m, r, sigma, T, sigma_sqrt_T, q)
+    d2 = d1 - sigma_sqrt_T
+    exp_neg_rT = math.exp(-r * T)
+    exp_neg_qT = math.exp(-q * T)
+    n_prime_d1 = _norm_pdf(d1)
+
+    gamma = n_prime_d1 * exp_neg_qT / (S * sigma_sqrt_T)
+    vega = S * exp_neg_qT * n_prime_d1 * sqrt_T / 100   # per 1% vol move
+    decay = -S * exp_neg_qT * n_prime_d1 * sigma / (2 * sqrt_T)
+
+    # Call CDFs are always needed; the put's follow from N(-x) = 1 - N(x)
+    Nd1 = _norm_cdf(d1)
+    Nd2 = _norm_cdf(d2)
+
+    if is_call:
+        price = S * exp_neg_qT * Nd1 - K * exp_neg_rT * Nd2
+        delta = exp_neg_qT * Nd1
+        theta = (decay - r * K * exp_neg_rT * Nd2 + q * S * exp_neg_qT * Nd1) / 365
+        rho = K * T * exp_neg_rT * Nd2 / 100
+    else:
+        Nmd1 = 1.0 - Nd1
+        Nmd2 = 1.0 - Nd2
+        price = K * exp_neg_rT * Nmd2 - S * exp_neg_qT * Nmd1
+        delta = -exp_neg_qT * Nmd1
+        theta = (decay + r * K * exp_neg_rT * Nmd2 - q * S * exp_neg_qT * Nmd1) / 365
+        rho = -K * T * exp_neg_rT * Nmd2 / 100
+
+    return max(price, 0.0), delta, gamma, vega, theta, rho
+
+
+@njit(fastmath=True, cache=True)
+def greeks_grid(spot_range, K, r, vol_range, T, is_call, q,
+                out_delta, out_gamma, out_vega, out_theta, out_rho):
+    """
+    Greeks over the spot × vol grid spanned by two 1-D axes, written in place
+    into pre-allocated (len(vol_range), len(spot_range)) output arrays.
+    log(S/K) depends only on spot, so it is taken once per column rather than
+    once per grid point. Loop-style so no temporaries are built.
+
+    Deliberately serial: Streamlit runs each session on its own thread, and
+    numba's default workqueue threading layer aborts the process on
+    concurrent parallel launches. On a 40 × 40 grid the thread fan-out would
+    cost more than it saves anyway.
+    """
+    n_spot = spot_range.size
+    S_floor = np.empty(n_spot)
+    log_m = np.empty(n_spot)
+    for j in range(n_spot):
+        S_floor[j] = max(spot_range[j], 1e-8)
+        log_m[j] = math.log(S_floor[j] / K)
+
+    for i in range(vol_range.size):
+        for j in range(n_spot):
+            _, delta, gamma, vega, theta, rho = _bs_greeks_logm(
+                S_floor[j], log_m[j], K, r, vol_range[i], T, is_call, q
+            )
+            out_delta[i, j] = delta
+            out_gamma[i, j] = gamma
+            out_vega[i, j] = vega
+            out_theta[i, j] = theta
+            out_rho[i, j] = rho
+
+
+# ------------------------------------------------------------------ #
+#  Python-facing wrappers                                              #
+# ------------------------------------------------------------------ #
+
+def calculate_price_and_greeks(S, K, r, sigma, T, option_type='call', q=0.0):
+    """
+    Scalar price and Greeks from one compiled kernel call.
+
+    Returns:
+        (price, dict with keys: delta, gamma, vega, theta, rho)
+    """
+    price, delta, gamma, vega, theta, rho = _bs_greeks_scalar(
+        float(S), float(K), float(r), float(sigma), float(T),
+        option_type.lower() == 'call', float(q)
+    )
+    return price, {
+        'delta': delta,
+        'gamma': gamma,
+        'vega':  vega,
+        'theta': theta,
+        'rho':   rho,
+    }
+
+
+def calculate_greeks_grid(spot_range, vol_range, K, r, T, option_type='call', q=0.0):
+    """
+    Greeks over a spot × volatility grid using the compiled grid kernel.
+
+    Parameters:
+        spot_range : 1-D numpy array of spot prices (grid columns)
+        vol_range  : 1-D numpy array of volatilities (grid rows)
+        K, r, T, option_type, q : scalar BSM parameters
+
+    Returns:
+        dict mapping Greek name → 2-D numpy array of shape
+        (len(vol_range), len(spot_range)) — same layout as np.meshgrid(spot, vol).
+        The kernel always computes in float64; float32 axes only make the
+        outputs float32 (half the storage at plot resolution).
+    """
+    dtype = np.result_type(np.asarray(spot_range), np.asarray(vol_range), np.float32)
+    spot_range = np.ascontiguousarray(spot_range, dtype=dtype)
+    vol_range = np.ascontiguousarray(vol_range, dtype=dtype)
+    shape = (vol_range.size, spot_range.size)
+    greeks = {name: np.empty(shape, dtype=dtype)
+              for name in ('delta', 'gamma', 'vega', 'theta', 'rho')}
+
+    greeks_grid(
+        spot_range, float(K), float(r), vol_range, float(T),
+        option_type.lower() == 'call', float(q),
+        greeks['delta'], greeks['gamma'], greeks['vega'],
+        greeks['theta'], greeks['rho'],
+    )
+    return greeks
+
+
+def warm_up():
+    """Trigger compilation (or on-disk cache load) for both option types."""
+    spot_range, vol_range = np.array([90.0, 110.0]), np.array([0.2, 0.3])
+    for option_type in ('call', 'put'):
+        calculate_price_and_greeks(100.0, 100.0, 0.05, 0.2, 0.5, option_type)
+        for dtype in (np.float64, np.float32):
+            calculate_greeks_grid(spot_range.astype(dtype), vol_range.astype(dtype),
+                                  100.0, 0.05, 0.5, option_type)